@@ -3,6 +3,7 @@ import shutil
 import logging
 import warnings
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Union, Optional, Collection, List, Dict, Type, Set, Iterator, Tuple
 
@@ -10,11 +11,12 @@ from pandas import HDFStore
 from pandas.io.common import stringify_path
 from pydantic import BaseModel, ValidationError
 from pyarrow import parquet as pq
+import pyarrow as pa
 from pyarrow import Table
 import pandas as pd
 import h5py
 
-from batdata.schemas import BatteryMetadata
+from batdata.schemas import BatteryMetadata, _get_json_schema
 from batdata.schemas.cycling import RawData, CycleLevelData, ColumnSchema
 from batdata.schemas.eis import EISData
 from batdata import __version__
@@ -73,28 +75,34 @@ class BatteryDataset:
         """
 
         Args:
-            metadata: Metadata that describe the battery construction, data provenance and testing routines
+            metadata: Metadata that describe the battery construction, data provenance and testing routines.
+                A :class:`BatteryMetadata` object is used directly rather than copied.
             raw_data: Time-series data of the battery state
             cycle_stats: Summaries of each cycle
             eis_data: EIS data taken at multiple times
         """
         if metadata is None:
             metadata = {}
-        elif isinstance(metadata, BaseModel):
+        elif isinstance(metadata, BaseModel) and not isinstance(metadata, BatteryMetadata):
             metadata = metadata.model_dump()
 
         # Warn if the version of the metadata is different
         version_mismatch = False
-        if (supplied_version := metadata.get('version', __version__)) != __version__:
+        supplied_version = metadata.version if isinstance(metadata, BatteryMetadata) else metadata.get('version', __version__)
+        if supplied_version != __version__:
             version_mismatch = True
             warnings.warn(f'Metadata was created in a different version of batdata. supplied={supplied_version}, current={__version__}.')
 
-        try:
-            self.metadata = BatteryMetadata(**metadata)
-        except ValidationError:
-            if version_mismatch:
-                warnings.warn('Metadata failed to validate, probably due to version mismatch. Discarding until we support backwards compatibility')
-                self.metadata = BatteryMetadata()
+        # Use metadata as-is if it has already been validated
+        if isinstance(metadata, BatteryMetadata):
+            self.metadata = metadata
+        else:
+            try:
+                self.metadata = BatteryMetadata(**metadata)
+            except ValidationError:
+                if version_mismatch:
+                    warnings.warn('Metadata failed to validate, probably due to version mismatch. Discarding until we support backwards compatibility')
+                    self.metadata = BatteryMetadata()
         self.raw_data = raw_data
         self.cycle_stats = cycle_stats
         self.eis_data = eis_data
@@ -127,20 +135,13 @@ class BatteryDataset:
         output = []
 
         # Check whether there are undocumented columns
-        def _find_undefined_columns(data: pd.DataFrame, column_schema: Type[ColumnSchema]) -> List[str]:
-            """Get the list of columns which are not defined in the schema"""
-
-            cols = set(data.columns).difference(column_schema.model_fields)
-            return list(cols)
-
         for attr_name, schema in _subsets.items():
             data = getattr(self, attr_name)
             defined_columns = getattr(self.metadata, f'{attr_name}_columns')
             if data is not None:
-                new_cols = _find_undefined_columns(data, schema)
-                undefined = set(new_cols).difference(defined_columns.keys())
+                #  Columns are undefined if they are neither in the schema nor described in the metadata
                 output.extend([f'Undefined column, {u}, in {attr_name}. Add a description into metadata.{attr_name}_columns'
-                               for u in undefined])
+                               for u in data.columns if u not in schema.model_fields and u not in defined_columns])
 
         return output
 
@@ -149,10 +150,11 @@ class BatteryDataset:
                        prefix: Optional[str] = None,
                        append: bool = False,
                        complevel: int = 0,
-                       complib: str = 'zlib'):
+                       complib: str = 'blosc:lz4',
+                       format: str = 'table'):
         """Save the data in the standardized HDF5 file format
 
-        This function wraps the ``to_hdf`` function of Pandas and supplies fixed values for some options
+        This function writes each subset through a Pandas ``HDFStore`` and supplies fixed values for some options
         so that the data is written in a reproducible format.
 
         Args:
@@ -160,51 +162,55 @@ class BatteryDataset:
             prefix: Prefix to use to differentiate this battery from (optionally) others stored in this HDF5 file
             append: Whether to clear any existing data in the HDF5 file before writing
             complevel: Specifies a compression level for data. A value of 0 disables compression.
-            complib: Specifies the compression library to be used.
+            complib: Specifies the compression library to be used, which only applies when ``complevel > 0``.
+                The default, Blosc with LZ4, compresses numerical data much faster than zlib at similar ratios.
+                Any library supported by PyTables is allowed (e.g., "zlib", "blosc:zstd").
+                Files compressed with Blosc can only be read by HDF5 tools with the Blosc filter installed
+                (e.g., h5py requires ``hdf5plugin``, and HDFView or MATLAB require the Blosc plugin).
+                Use "zlib" for files which must be readable by any HDF5 library.
+            format: Format in which to store the data. The default, "table", allows partial reads and
+                is required by :meth:`iter_batdata_hdf`. "fixed" is faster to write and read in full.
         """
 
         # Delete the old file if present
         if isinstance(path_or_buf, (str, Path)) and (Path(path_or_buf).is_file() and not append):
             Path(path_or_buf).unlink()
 
-        # Store the various datasets
-        #  Note that we use the "table" format to allow for partial reads / querying
-        for key in _subsets:
-            data = getattr(self, key)
-            if data is not None:
-                if prefix is not None:
-                    key = f'{prefix}_{key}'
-                data.to_hdf(path_or_buf, key, complevel=complevel,
-                            complib=complib, append=False, format='table',
-                            index=False)
-
-        # Create logic for adding metadata
-        def add_metadata(f: HDFStore):
-            """Put the metadata in a standard location at the root of the HDF file"""
+        # Create logic for writing the datasets and metadata
+        def write_data(f: HDFStore):
+            """Store each dataset then put the metadata in a standard location at the root of the HDF file"""
+            for key in _subsets:
+                data = getattr(self, key)
+                if data is not None:
+                    if prefix is not None:
+                        key = f'{prefix}_{key}'
+                    f.put(key, data, format=format, index=False, append=False)
+
             metadata = self.metadata.model_dump_json()
             if append and 'metadata' in f.root._v_attrs:
                 existing_metadata = f.root._v_attrs.metadata
                 if metadata != existing_metadata:
                     warnings.warn('Metadata already in HDF5 differs from new metadata')
             f.root._v_attrs.metadata = metadata
-            f.root._v_attrs.schema = self.metadata.model_json_schema()
+            f.root._v_attrs.schema = _get_json_schema(type(self.metadata))
 
-        # Apply the metadata addition function
+        # Apply the write function, opening the file only once
         path_or_buf = stringify_path(path_or_buf)
         if isinstance(path_or_buf, (str, Path)):
             with HDFStore(
                     path_or_buf, mode='a', complevel=complevel, complib=complib
             ) as store:
-                add_metadata(store)
+                write_data(store)
                 store.flush()
         else:
-            add_metadata(path_or_buf)
+            write_data(path_or_buf)
 
     @classmethod
     def from_batdata_hdf(cls,
                          path_or_buf: Union[str, Path, HDFStore],
                          subsets: Optional[Collection[str]] = None,
-                         prefix: Union[str, None, int] = None) -> 'BatteryDataset':
+                         prefix: Union[str, None, int] = None,
+                         columns: Optional[Collection[str]] = None) -> 'BatteryDataset':
         """Read the battery data from an HDF file
 
         Use :meth:`all_cells_from_batdata_hdf` to read all datasets from a file.
@@ -215,9 +221,16 @@ class BatteryDataset:
             prefix: (``str``) Prefix designating which battery extract from this file,
                 or (``int``) index within the list of available prefixes, sorted alphabetically.
                 The default is to read the default prefix (``None``).
-
+            columns: Which columns to read from each subset. Columns absent from a subset are ignored.
+                Only data stored in the "table" format are read partially from disk.
+                The default is to read all columns.
         """
 
+        # Open the file once for all reads
+        if not isinstance(path_or_buf, HDFStore):
+            with HDFStore(path_or_buf, mode='r') as store:
+                return cls.from_batdata_hdf(store, subsets=subsets, prefix=prefix, columns=columns)
+
         # Determine which datasets to read
         read_all = False
         if subsets is None:
@@ -225,10 +238,33 @@ class BatteryDataset:
             read_all = True
 
         # Determine which prefix to read, if an int is provided
+        metadata = None
         if isinstance(prefix, int):
-            _, prefixes = cls.inspect_batdata_hdf(path_or_buf)
+            metadata, prefixes = cls.inspect_batdata_hdf(path_or_buf)
             prefix = sorted(prefixes)[prefix]
 
+        data = cls._read_hdf_subsets(path_or_buf, prefix, subsets, read_all, columns)
+
+        # Read out the battery metadata, if not already parsed while finding the prefix
+        if metadata is None:
+            metadata = BatteryMetadata.model_validate_json(path_or_buf.root._v_attrs.metadata)
+
+        return cls(**data, metadata=metadata)
+
+    @staticmethod
+    def _read_hdf_subsets(store: HDFStore, prefix: Optional[str], subsets: Collection[str],
+                          read_all: bool, columns: Optional[Collection[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Read the data tables for a single battery from an HDF5 file
+
+        Args:
+            store: HDFStore holding the data
+            prefix: Prefix designating which battery extract from this file
+            subsets: Which subsets of data to read from the data file
+            read_all: Whether to skip subsets which are not in the file rather than raise an error
+            columns: Which columns to read from each subset, if not all
+        Returns:
+            Map of subset name to the data
+        """
         data = {}
         for subset in subsets:
             # Throw error if user provides an unknown subset name
@@ -242,45 +278,58 @@ class BatteryDataset:
                 key = subset
 
             try:
-                data[subset] = pd.read_hdf(path_or_buf, key)
+                storer = store.get_storer(key)
             except KeyError as exc:
                 if read_all:
                     continue
                 else:
                     raise ValueError(f'File does not contain {key}') from exc
 
+            if columns is None:
+                data[subset] = store.select(key)
+            elif storer.is_table:
+                #  Tables skip columns which are not present
+                data[subset] = store.select(key, columns=list(columns))
+            else:
+                #  Fixed-format data can only be read in their entirety
+                subset_data = store.select(key)
+                data[subset] = subset_data[[c for c in columns if c in subset_data.columns]]
+
         # If no data with this prefix is found, report which ones are found in the file
         if len(data) == 0:
             raise ValueError(f'No data available for prefix "{prefix}". '
                              'Call `BatteryDataset.inspect_batdata_hdf` to gather a list of available prefixes.')
-
-        # Read out the battery metadata
-        if isinstance(path_or_buf, (str, Path)):
-            with h5py.File(path_or_buf, 'r') as f:
-                metadata = BatteryMetadata.model_validate_json(f.attrs['metadata'])
-        else:
-            metadata = BatteryMetadata.model_validate_json(path_or_buf.root._v_attrs.metadata)
-
-        return cls(**data, metadata=metadata)
+        return data
 
     @classmethod
-    def all_cells_from_batdata_hdf(cls, path: Union[str, Path], subsets: Optional[Collection[str]] = None) -> Iterator[Tuple[str, 'BatteryDataset']]:
+    def all_cells_from_batdata_hdf(cls, path: Union[str, Path], subsets: Optional[Collection[str]] = None,
+                                   columns: Optional[Collection[str]] = None) -> Iterator[Tuple[str, 'BatteryDataset']]:
         """Iterate over all cells in an HDF file
 
+        The metadata are parsed once per file, and each cell receives its own copy.
+
         Args:
             path: Path to the HDF file
             subsets : Which subsets of data to read from the data file (e.g., raw_data, cycle_stats)
+            columns: Which columns to read from each subset. Columns absent from a subset are ignored.
+                The default is to read all columns.
         Yields:
             - Name of the cell
             - Cell data
         """
 
-        # Start by gathering all names of the cells
-        _, names = cls.inspect_batdata_hdf(path)
+        # Determine which datasets to read
+        read_all = subsets is None
+        if read_all:
+            subsets = _subsets
 
         with HDFStore(path, mode='r') as fp:  # Only open once
+            # Start by gathering all names of the cells, and the metadata they share
+            metadata, names = cls.inspect_batdata_hdf(fp)
+
             for name in names:
-                yield name, cls.from_batdata_hdf(fp, prefix=name, subsets=subsets)
+                data = cls._read_hdf_subsets(fp, name, subsets, read_all, columns)
+                yield name, cls(**data, metadata=metadata.model_copy(deep=True))
 
     @staticmethod
     def inspect_batdata_hdf(path_or_buf: Union[str, Path, HDFStore]) -> tuple[BatteryMetadata, Set[Optional[str]]]:
@@ -300,7 +349,7 @@ class BatteryDataset:
                 keys = list(f.keys())
         else:
             metadata = BatteryMetadata.model_validate_json(path_or_buf.root._v_attrs.metadata)
-            keys = [k[1:] for k in path_or_buf.keys()]  # First char is always "/"
+            keys = list(path_or_buf.root._v_children)  # Only the top-level groups, without walking the whole file
 
         # Get the names by gathering all names before the "-" in group names
         names = set()
@@ -314,6 +363,44 @@ class BatteryDataset:
                         names.add(name)
         return metadata, names
 
+    @staticmethod
+    def iter_batdata_hdf(path_or_buf: Union[str, Path, HDFStore],
+                         subset: str = 'raw_data',
+                         prefix: Optional[str] = None,
+                         chunk_size: int = 1_000_000,
+                         columns: Optional[Collection[str]] = None) -> Iterator[pd.DataFrame]:
+        """Iterate over one subset of the data in an HDF file in chunks of rows
+
+        Use to process data which are too large to hold in memory at once.
+        The subset must have been written in the "table" format (the default of :meth:`to_batdata_hdf`).
+
+        Args:
+            path_or_buf: File path or HDFStore object
+            subset: Which subset of data to read (e.g., raw_data, cycle_stats)
+            prefix: Prefix designating which battery to read from this file
+            chunk_size: Maximum number of rows per chunk
+            columns: Which columns to read. The default is to read all columns.
+        Yields:
+            Consecutive rows of the subset
+        Raises:
+            (ValueError): If the subset is unknown or was not stored in the "table" format,
+                which is required for reading in chunks
+        """
+
+        if subset not in _subsets:
+            raise ValueError(f'Unknown subset: {subset}')
+        key = subset if prefix is None else f'{prefix}_{subset}'
+
+        # Open the file, if needed
+        if not isinstance(path_or_buf, HDFStore):
+            with HDFStore(path_or_buf, mode='r') as store:
+                yield from BatteryDataset.iter_batdata_hdf(store, subset, prefix, chunk_size, columns)
+            return
+
+        if not path_or_buf.get_storer(key).is_table:
+            raise ValueError(f'Subset {key} was not stored in the "table" format, which is required to read it in chunks')
+        yield from path_or_buf.select(key, columns=columns, chunksize=chunk_size)
+
     @staticmethod
     def get_metadata_from_hdf5(path: Union[str, Path]) -> BatteryMetadata:
         """Get battery metadata from an HDF file without reading the data
@@ -355,12 +442,20 @@ class BatteryDataset:
                 inputs[k] = pd.DataFrame(d[k])
         return cls(**inputs)
 
-    def to_batdata_parquet(self, path: Union[Path, str], overwrite: bool = True) -> Dict[str, Path]:
+    def to_batdata_parquet(self, path: Union[Path, str], overwrite: bool = True, compression: str = 'zstd',
+                           compression_level: Optional[int] = None) -> Dict[str, Path]:
         """Write battery data to a directory of Parquet files
 
+        Floating-point columns are stored with the byte-stream-split encoding,
+        which compresses slowly-varying measurements (e.g., voltage) better than dictionary encoding.
+
         Args:
             path: Path in which to write to
             overwrite: Whether to overwrite an existing directory
+            compression: Compression codec to use for each file. The default, ZSTD, produces smaller files
+                than Snappy (the PyArrow default) at comparable speed. Any codec supported by PyArrow is allowed.
+            compression_level: Compression level for codecs which support one.
+                The default is level 3 for ZSTD and the library default for other codecs.
         Returns:
             Map of the name of the subset to
         """
@@ -378,6 +473,8 @@ class BatteryDataset:
             'battery_metadata': self.metadata.model_dump_json(exclude_defaults=True),
             'write_date': datetime.now().isoformat()
         }
+        if compression_level is None and compression == 'zstd':
+            compression_level = 3
         written = {}
         for key in _subsets:
             if (data := getattr(self, key)) is None:
@@ -385,21 +482,30 @@ class BatteryDataset:
             # Put the metadata for the battery into the table's schema
             #  TODO (wardlt): Figure out if it can go in the file-metadata
             data_path = path / f'{key}.parquet'
+            #  Replacing only the metadata re-uses the column buffers, unlike casting to a new schema
             table = Table.from_pandas(data, preserve_index=False)
-            new_schema = table.schema.with_metadata({**my_metadata, **table.schema.metadata})
-            table = table.cast(new_schema)
-            pq.write_table(table, where=data_path)
+            table = table.replace_schema_metadata({**my_metadata, **table.schema.metadata})
+
+            #  Dictionary encoding takes precedence over byte-stream-split, so only use it for other columns
+            float_cols = [f.name for f in table.schema if pa.types.is_floating(f.type)]
+            pq.write_table(table, where=data_path, compression=compression, compression_level=compression_level,
+                           use_byte_stream_split=float_cols,
+                           use_dictionary=[c for c in table.column_names if c not in float_cols])
 
             written[key] = data_path
         return written
 
     @classmethod
-    def from_batdata_parquet(cls, path: Union[str, Path], subsets: Optional[Collection[str]] = None):
+    def from_batdata_parquet(cls, path: Union[str, Path],
+                             subsets: Optional[Collection[str]] = None,
+                             columns: Optional[Collection[str]] = None):
         """Read the battery data from an HDF file
 
         Args:
             path: Path to a directory containing parquet files for a specific batter
             subsets: Which subsets of data to read from the data file (e.g., raw_data, cycle_stats)
+            columns: Which columns to read from each subset. Columns absent from a subset are ignored.
+                The default is to read all columns.
         """
 
         # Find the parquet files, if no specification is listed
@@ -411,19 +517,36 @@ class BatteryDataset:
             raise ValueError(f'No data available for {path}')
 
         # Load each subset
+        def _read_subset(subset: str) -> Table:
+            parquet_file = pq.ParquetFile(path / f'{subset}.parquet', memory_map=True)
+            if columns is not None:
+                #  Only the selected columns are read from disk and decompressed
+                return parquet_file.read(columns=[c for c in columns if c in parquet_file.schema_arrow.names])
+            return parquet_file.read()
+
+        if len(subsets) > 1:
+            #  Each subset is a separate file, and PyArrow releases the GIL while reading and decompressing
+            with ThreadPoolExecutor(max_workers=len(subsets)) as executor:
+                tables = dict(zip(subsets, executor.map(_read_subset, subsets)))
+        else:
+            tables = {subset: _read_subset(subset) for subset in subsets}
+
         metadata = None
         data = {}
         for subset in subsets:
             data_path = path / f'{subset}.parquet'
-            table = pq.read_table(data_path)
-            data[subset] = table
+            table = tables.pop(subset)  # Drop our reference so the table is freed once converted
+            my_metadata = (table.schema.metadata or {}).get(b'battery_metadata')
+
+            #  Release the Arrow buffers as each column is converted, and avoid consolidating columns into blocks
+            data[subset] = table.to_pandas(self_destruct=True, split_blocks=True)
+            del table
 
             # Load or check the metadata
-            if b'battery_metadata' not in table.schema.metadata:
+            if my_metadata is None:
                 warnings.warn(f'Metadata not found in {data_path}')
                 continue
 
-            my_metadata = table.schema.metadata[b'battery_metadata']
             if metadata is None:
                 metadata = my_metadata
             elif my_metadata != metadata:
@@ -459,3 +582,31 @@ class BatteryDataset:
         if b'battery_metadata' not in schema.metadata:
             raise ValueError(f'No metadata in {pq_path}')
         return BatteryMetadata.model_validate_json(schema.metadata[b'battery_metadata'])
+
+    @staticmethod
+    def iter_batdata_parquet(path: Union[str, Path],
+                             subset: str = 'raw_data',
+                             chunk_size: int = 1_000_000,
+                             columns: Optional[Collection[str]] = None) -> Iterator[pd.DataFrame]:
+        """Iterate over one subset of the data in a directory of parquet files in chunks of rows
+
+        Use to process data which are too large to hold in memory at once.
+
+        Args:
+            path: Path to a directory containing parquet files for a specific battery
+            subset: Which subset of data to read (e.g., raw_data, cycle_stats)
+            chunk_size: Maximum number of rows per chunk
+            columns: Which columns to read. Columns absent from the subset are ignored.
+                The default is to read all columns.
+        Yields:
+            Consecutive rows of the subset
+        """
+
+        if subset not in _subsets:
+            raise ValueError(f'Unknown subset: {subset}')
+
+        parquet_file = pq.ParquetFile(Path(path) / f'{subset}.parquet', memory_map=True)
+        if columns is not None:
+            columns = [c for c in columns if c in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
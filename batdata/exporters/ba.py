@@ -1,14 +1,12 @@
 """Tools for streamlining upload to `Battery Archive <https://batteryarchive.org/>`_"""
 
-from typing import Callable, Any, Optional
+from typing import Callable, Optional
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 from uuid import uuid4
 import logging
 import json
 
-import numpy as np
 import pandas as pd
 
 from .base import DatasetExporter
@@ -17,15 +15,18 @@ from ..schemas import BatteryMetadata
 
 logger = logging.getLogger(__name__)
 
-# Mappings between our column names and theirs, with an optional function to perform conversion
+_time_format = '%m/%d/%Y %H:%M:%S.%f'
+"""Format used by BatteryArchive for dates"""
+
+# Mappings between our column names and theirs, with an optional function to convert the whole column
 # TODO (wardlt): Standardize fields for the cumulative charge and discharge for each cycle separately (#75)
 # TODO (wardlt): Differentiate the cell temperature from the environment temperature (#76)
 # TODO (wardlt): Compute more derived fields from BatteryArchive (#77)
-_timeseries_reference: dict[str, tuple[str, Optional[Callable[[Any], Any]]]] = {
+_timeseries_reference: dict[str, tuple[str, Optional[Callable[[pd.Series], pd.Series]]]] = {
     'current': ('i', None),
     'voltage': ('v', None),
     'temperature': ('env_temperature', None),  # TODO (wardlt): @ypreger, would you prefer unknown temps as env or cell?
-    'time': ('date_time', lambda x: datetime.fromtimestamp(x).strftime('%m/%d/%Y %H:%M:%S.%f')),
+    'time': ('date_time', lambda x: pd.to_datetime(x, unit='s').dt.strftime(_time_format)),  # UTC
     'cycle_number': ('cycle_index', lambda x: x + 1),  # BA starts indices from 1
     'test_time': ('test_time', None),
 }
@@ -65,16 +66,21 @@ class BatteryArchiveExporter(DatasetExporter):
             path: Root path for writing cycling data
         """
 
-        num_chunks = len(data) // self.chunk_size + 1
+        # Determine which of our columns are present once, as all chunks have the same columns
+        conversions = [(my_col, out_col, out_fun) for my_col, (out_col, out_fun) in _timeseries_reference.items()
+                       if my_col in data.columns]
+
+        num_chunks = max(1, -(-len(data) // self.chunk_size))  # Ceiling division, but always write one file
         logger.info(f'Writing time series data to disk in {num_chunks} chunks')
-        for i, chunk in enumerate(np.array_split(data, num_chunks)):
+        for i in range(num_chunks):
+            chunk = data.iloc[i * self.chunk_size:(i + 1) * self.chunk_size]  # Slices do not copy the data
+
             # Convert all of our columns
-            out_chunk = pd.DataFrame()
-            for my_col, (out_col, out_fun) in _timeseries_reference.items():
-                if my_col in chunk:
-                    out_chunk[out_col] = chunk[my_col]
-                    if out_fun is not None:
-                        out_chunk[out_col] = out_chunk[out_col].apply(out_fun)
+            #  Conversions run per chunk so that only one chunk of formatted strings is held in memory
+            out_chunk = pd.DataFrame({
+                out_col: chunk[my_col] if out_fun is None else out_fun(chunk[my_col])
+                for my_col, out_col, out_fun in conversions
+            })
 
             # Add a cell id to the frame
             out_chunk['cell_id'] = cell_id
@@ -5,9 +5,8 @@ import numpy as np
 import pandas as pd
 
 from batdata.extractors.base import BatteryDataExtractor
-from batdata.schemas.cycling import ChargingState
 from batdata.utils import drop_cycles
-from batdata.postprocess.tagging import AddMethod, AddSteps, AddSubSteps
+from batdata.postprocess.tagging import AddMethod, AddSteps, AddSubSteps, assign_charging_state
 
 
 class ArbinExtractor(BatteryDataExtractor):
@@ -25,7 +24,9 @@ class ArbinExtractor(BatteryDataExtractor):
                            start_time: float = 0) -> pd.DataFrame:
 
         # Read the file and rename the file
-        df = pd.read_csv(file)
+        #  Only parse the columns which are used below
+        df = pd.read_csv(file, engine='pyarrow',
+                         usecols=['Cycle_Index', 'DateTime', 'Current', 'Temperature', 'Internal_Resistance', 'Voltage'])
         df = df.rename(columns={'DateTime': 'test_time'})
 
         # create fresh dataframe
@@ -44,15 +45,9 @@ class ArbinExtractor(BatteryDataExtractor):
         # Drop the duplicate rows
         df_out = drop_cycles(df_out)
 
-        # Determine whether the battery is charging or discharging:
-        #   0 is rest, 1 is charge, -1 is discharge
+        # Determine whether the battery is charging or discharging
         # TODO (wardlt): This function should move to post-processing
-        def compute_state(x):
-            if abs(x) < self.eps:
-                return ChargingState.hold
-            return ChargingState.charging if x > 0 else ChargingState.discharging
-
-        df_out['state'] = df_out['current'].apply(compute_state)
+        df_out['state'] = assign_charging_state(df_out['current'].to_numpy(), self.eps)
 
         # Determine the method uses to control charging/discharging
         AddSteps().enhance(df_out)
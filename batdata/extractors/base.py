@@ -3,6 +3,7 @@ from typing import List, Optional, Union, Iterator
 from pathlib import Path
 import os
 
+import numpy as np
 import pandas as pd
 
 from batdata.data import BatteryDataset
@@ -117,11 +118,17 @@ class BatteryDataExtractor:
             output_dfs.append(df_out)
 
             # Increment the start cycle and time to determine starting point of next file
-            start_cycle += df_out['cycle_number'].max() - df_out['cycle_number'].min() + 1
-            start_time = df_out['test_time'].max()
+            #  The offsets are needed before reading the next file, so compute them from the raw arrays
+            start_cycle += np.ptp(df_out['cycle_number'].to_numpy()) + 1
+            start_time = df_out['test_time'].to_numpy().max()
 
         # Combine the data from all files
-        df_out = pd.concat(output_dfs, ignore_index=True)
+        #  A single file needs only a new index, which avoids copying its data
+        if len(output_dfs) == 1:
+            df_out = output_dfs[0]
+            df_out.reset_index(drop=True, inplace=True)
+        else:
+            df_out = pd.concat(output_dfs, ignore_index=True)
 
         # Attach the metadata and return the data
         return BatteryDataset(raw_data=df_out, metadata=metadata)
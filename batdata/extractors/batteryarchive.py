@@ -1,4 +1,5 @@
 from collections import defaultdict
+import warnings
 from typing import Union, List, Iterator, Tuple, Optional
 
 import pandas as pd
@@ -22,11 +23,9 @@ class BatteryArchiveExtractor(BatteryDataExtractor):
         # Pair files in the same directory that begin with the same prefix
         paired_files = defaultdict(list)
         for file in csvs:
-            file_lower = file.lower()
-
             # if it is denoted with BA's "timeseries" or "cycle_data" postfix,
             #  get the prefix and wait until we find its mate
-            if file_lower.endswith('cycle_data.csv') or file_lower.endswith('timeseries.csv'):
+            if file.lower().endswith(('cycle_data.csv', 'timeseries.csv')):
                 prefix = file[:-14]
                 paired_files[prefix].append(file)
 
@@ -52,8 +51,9 @@ class BatteryArchiveExtractor(BatteryDataExtractor):
             Time series in a format ready for HDF5 file
         """
 
-        # Read in the ASCII file (I found this notation works)
-        df = pd.read_csv(path)
+        # Read in the ASCII file
+        #  The PyArrow engine converts ISO-formatted dates directly to datetimes rather than Python strings
+        df = pd.read_csv(path, engine='pyarrow')
         df = df.rename(columns={'Test_Time (s)': 'test_time', 'Cycle_Index': 'cycle_number',
                                 'Date_Time': 'date_time', 'Current (A)': 'current',
                                 'Voltage (V)': 'voltage', 'Cell_Temperature (C)': 'temperature'})
@@ -61,6 +61,19 @@ class BatteryArchiveExtractor(BatteryDataExtractor):
         # Change the datatypes for the cycle_number
         df['cycle_number'] = df['cycle_number'].astype(int)
 
+        # Store dates as datetimes rather than strings
+        if 'date_time' in df.columns:
+            #  PyArrow only recognizes ISO-formatted dates, so parse any others with pandas
+            if not pd.api.types.is_datetime64_dtype(df['date_time']):
+                try:
+                    df['date_time'] = pd.to_datetime(df['date_time'], cache=True)
+                except (ValueError, TypeError):
+                    warnings.warn(f'Unable to parse the dates in {path}. Leaving them as strings')
+
+            #  Use nanosecond resolution, the only resolution which survives a round trip through HDF5
+            if pd.api.types.is_datetime64_dtype(df['date_time']):
+                df['date_time'] = df['date_time'].astype('datetime64[ns]')
+
         return df
 
     def parse_to_dataframe(self, group: List[str], metadata: Optional[dict]):
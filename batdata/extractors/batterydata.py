@@ -1,10 +1,10 @@
 """Parse from the CSV formats of batterydata.energy.gov"""
+import os
 import re
 import logging
 from pathlib import Path
 from dataclasses import dataclass
 from collections import defaultdict
-from datetime import datetime, timedelta
 from typing import Union, List, Iterator, Tuple, Optional
 
 import pandas as pd
@@ -17,6 +17,9 @@ _fname_match = re.compile(r'(?P<name>[-\w]+)-(?P<type>summary|raw)\.csv')
 
 logger = logging.getLogger(__name__)
 
+_datenum_epoch = 719529
+"""Day number of 1/1/1970, the POSIX epoch, in MATLAB's count of days from 1/1/0000"""
+
 # TODO (wardlt): Columns that yet to have a home in the schema:
 #  - Cell2
 _name_map_raw = {
@@ -39,24 +42,19 @@ def convert_raw_signal_to_batdata(input_df: pd.DataFrame, store_all: bool) -> pd
     Returns:
         DataFrame in the batdata format
     """
-    output = pd.DataFrame()
+    # Select the columns to keep, adding all other columns as-is if desired
+    columns = list(_name_map_raw)
+    if store_all:
+        columns.extend(col for col in input_df.columns if col not in _name_map_raw)
 
-    # Rename columns that are otherwise the same
-    for orig, new in _name_map_raw.items():
-        output[new] = input_df[orig]
+    # Rename columns that are otherwise the same, copying the data only once
+    output = input_df[columns].rename(columns=_name_map_raw)
 
     # Decrement the indices from 1-indexed to 0-indexed
     output[['cycle_number', 'step_index']] -= 1
 
     # Convert the date to POSIX timestamp (ease of use in Python) from days from 1/1/0000
-    begin_time = datetime(year=1, month=1, day=1)
-    output['time'] = output['time'].apply(lambda x: (timedelta(days=x - 366) + begin_time).timestamp())
-
-    # Add all other columns as-is
-    if store_all:
-        for col in input_df.columns:
-            if col not in _name_map_raw:
-                output[col] = input_df[col]
+    output['time'] = (output['time'] - _datenum_epoch) * 86400
 
     return output
 
@@ -87,19 +85,13 @@ def convert_summary_to_batdata(input_df: pd.DataFrame, store_all: bool) -> pd.Da
         DataFrame in the batdata format
     """
 
-    output = pd.DataFrame()
-
-    # Rename columns that are otherwise the same
-    for orig, new in _name_map_summary.items():
-        output[new] = input_df[orig]
-
-    # Add all other columns as-is
+    # Select the columns to keep, adding all other columns as-is if desired
+    columns = list(_name_map_summary)
     if store_all:
-        for col in input_df.columns:
-            if col not in _name_map_summary:
-                output[col] = input_df[col]
+        columns.extend(col for col in input_df.columns if col not in _name_map_summary)
 
-    return output
+    # Rename columns that are otherwise the same, copying the data only once
+    return input_df[columns].rename(columns=_name_map_summary)
 
 
 def convert_eis_data_to_batdata(input_df: pd.DataFrame) -> pd.DataFrame:
@@ -111,19 +103,18 @@ def convert_eis_data_to_batdata(input_df: pd.DataFrame) -> pd.DataFrame:
         EIS data in batdata format
     """
 
-    # Filter out the non-EIS data
-    input_df = input_df[~input_df['Frequency_Hz'].isnull()]
-
-    # Use the cycle index as a test index
-    output = pd.DataFrame()
-    output['test_id'] = input_df['Cycle_Index']
-
-    # Drop units off and make lower case
-    cols = ['Frequency_Hz', 'Z_Imag_Ohm', 'Z_Real_Ohm', 'Z_Mag_Ohm', 'Z_Phase_Degree']
-    for col in cols:
-        my_name = "_".join(col.lower().split("_")[:-1])
-        output[my_name] = input_df[col]
-    return output
+    # Filter out the non-EIS data and rename the columns in a single selection
+    #  The cycle index is used as a test index, and the other columns drop their units and are lower case
+    rename_map = {
+        'Cycle_Index': 'test_id',
+        'Frequency_Hz': 'frequency',
+        'Z_Imag_Ohm': 'z_imag',
+        'Z_Real_Ohm': 'z_real',
+        'Z_Mag_Ohm': 'z_mag',
+        'Z_Phase_Degree': 'z_phase',
+    }
+    is_eis = input_df['Frequency_Hz'].notna().to_numpy()
+    return input_df.loc[is_eis, list(rename_map)].rename(columns=rename_map)
 
 
 @dataclass
@@ -144,7 +135,7 @@ class BDExtractor(BatteryDataExtractor):
         # Find files that match the CSV naming convention
         groups = defaultdict(list)  # Map of cell name to the output
         for file in files:
-            if (match := _fname_match.match(Path(file).name)) is not None:
+            if (match := _fname_match.match(os.path.basename(file))) is not None:  # Avoids building a Path per file
                 groups[match.group('name')].append(file)
 
         yield from groups.values()
@@ -169,9 +160,9 @@ class BDExtractor(BatteryDataExtractor):
             # Different parsing logic by type
             data_type = match.group('type')
             if data_type == 'summary':
-                cycle_stats = convert_summary_to_batdata(pd.read_csv(path), self.store_all)
+                cycle_stats = convert_summary_to_batdata(pd.read_csv(path, engine='pyarrow'), self.store_all)
             elif data_type == 'raw':
-                nrel_data = pd.read_csv(path)
+                nrel_data = pd.read_csv(path, engine='pyarrow')
                 raw_data = convert_raw_signal_to_batdata(nrel_data, self.store_all)
 
                 # Get EIS data, if available
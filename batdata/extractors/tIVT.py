@@ -6,10 +6,9 @@ import numpy as np
 import pandas as pd
 
 from batdata.extractors.base import BatteryDataExtractor
-from batdata.schemas.cycling import ChargingState
 from batdata.utils import drop_cycles
-from batdata.postprocess.tagging import add_steps, add_method, add_substeps
-from batdata.postprocess.cycle_stats import compute_capacity_energy
+from batdata.postprocess.tagging import AddMethod, AddSteps, AddSubSteps, assign_charging_state
+from batdata.postprocess.integral import StateOfCharge
 
 from scipy.interpolate import interp1d
 from scipy.optimize import differential_evolution
@@ -66,21 +65,16 @@ class TIVTExtractor(BatteryDataExtractor):
         # Drop the duplicate rows
         df_out = drop_cycles(df_out)
 
-        # Determine whether the battery is charging or discharging:
-        #   0 is rest, 1 is charge, -1 is discharge
+        # Determine whether the battery is charging or discharging
         # TODO (wardlt): This function should move to post-processing
-        def compute_state(x):
-            if abs(x) < self.eps:
-                return ChargingState.hold
-            return ChargingState.charging if x > 0 else ChargingState.discharging
-        df_out['state'] = df_out['current'].apply(compute_state)
+        df_out['state'] = assign_charging_state(df_out['current'].to_numpy(), self.eps)
 
         # Determine the method uses to control charging/discharging
-        add_steps(df_out)
-        add_method(df_out)
-        add_substeps(df_out)
+        AddSteps().enhance(df_out)
+        AddMethod().enhance(df_out)
+        AddSubSteps().enhance(df_out)
 
         # Add capacity and energy calculations
-        df_out = compute_capacity_energy(df_out)
+        StateOfCharge().enhance(df_out)
 
         return df_out
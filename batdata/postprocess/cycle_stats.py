@@ -31,8 +31,8 @@ class CycleTimes(CycleSummarizer):
         time_summary['next_diff'] = time_summary['cycle_number'].diff(-1).iloc[:-1]
         if (time_summary['next_diff'].iloc[:-1] != -1).any():
             warnings.warn('Some cycles are missing from the dataframe. Time durations for those cycles may be too short')
-        has_next_cycle = time_summary.query('next_diff == -1')
-        time_summary.loc[has_next_cycle.index, 'cycle_duration'] = -time_summary['cycle_start'].diff(-1)[has_next_cycle.index]
+        has_next_cycle = time_summary['next_diff'].to_numpy() == -1
+        time_summary.loc[has_next_cycle, 'cycle_duration'] = -time_summary['cycle_start'].diff(-1)[has_next_cycle]
 
         # Update the cycle_data accordingly
         cycle_data[self.column_names] = np.nan
@@ -70,20 +70,30 @@ class CapacityPerCycle(CycleSummarizer):
             cycle_data[name] = np.nan
 
         # Get the indices of the beginning of each cycle
-        raw_data = raw_data.reset_index()  # Ensure a sequential ordering from 0
-        start_inds = raw_data.drop_duplicates('cycle_number', keep='first').index
+        start_inds = np.flatnonzero(~raw_data['cycle_number'].duplicated().to_numpy())
+
+        # Gather the columns once as arrays, rather than creating a dataframe for each cycle
+        #  Use the integrals if they are available, converting back to A-s and J
+        if self.reuse_integrals and 'cycle_energy' in raw_data.columns and 'cycle_capacity' in raw_data.columns:
+            capacity = raw_data['cycle_capacity'].to_numpy() * 3600
+            energy = raw_data['cycle_energy'].to_numpy() * 3600
+            test_time = current = power = None
+        else:
+            capacity = energy = None
+            test_time = raw_data['test_time'].to_numpy()
+            current = raw_data['current'].to_numpy()
+            power = current * raw_data['voltage'].to_numpy()
 
         # Loop over each cycle. Using the starting point of this cycle and the first point of the next as end caps
         for cyc, (start_ind, stop_ind) in enumerate(zip_longest(start_inds, start_inds[1:] + 1, fillvalue=len(raw_data))):
-            cycle_subset = raw_data.iloc[start_ind:stop_ind]
-
             # Perform the integration
-            if self.reuse_integrals and 'cycle_energy' in cycle_subset.columns and 'cycle_capacity' in cycle_subset.columns:
-                capacity_change = cycle_subset['cycle_capacity'].values * 3600  # To A-s
-                energy_change = cycle_subset['cycle_energy'].values * 3600  # To J
+            if capacity is not None:
+                capacity_change = capacity[start_ind:stop_ind]
+                energy_change = energy[start_ind:stop_ind]
             else:
-                capacity_change = cumulative_trapezoid(cycle_subset['current'], x=cycle_subset['test_time'])
-                energy_change = cumulative_trapezoid(cycle_subset['current'] * cycle_subset['voltage'], x=cycle_subset['test_time'])
+                cycle_time = test_time[start_ind:stop_ind]
+                capacity_change = cumulative_trapezoid(current[start_ind:stop_ind], x=cycle_time)
+                energy_change = cumulative_trapezoid(power[start_ind:stop_ind], x=cycle_time)
 
             # Estimate if the battery starts as charged or discharged
             max_charge = capacity_change.max()
@@ -107,10 +117,9 @@ class CapacityPerCycle(CycleSummarizer):
                 charge_eng = energy_change.max()
                 discharge_eng = charge_eng - energy_change[-1]
 
-            cycle_data.loc[cyc, 'energy_charge'] = charge_eng / 3600.  # To W-hr
-            cycle_data.loc[cyc, 'energy_discharge'] = discharge_eng / 3600.
-            cycle_data.loc[cyc, 'capacity_charge'] = charge_cap / 3600.  # To A-hr
-            cycle_data.loc[cyc, 'capacity_discharge'] = discharge_cap / 3600.
+            #  Convert energies to W-hr and capacities to A-hr
+            cycle_data.loc[cyc, ['energy_charge', 'energy_discharge', 'capacity_charge', 'capacity_discharge']] = \
+                np.array([charge_eng, discharge_eng, charge_cap, discharge_cap]) / 3600.
 
 
 class StateOfCharge(RawDataEnhancer):
@@ -130,22 +139,23 @@ class StateOfCharge(RawDataEnhancer):
     column_names = ['cycle_capacity', 'cycle_energy']
 
     def enhance(self, data: pd.DataFrame):
-        # Add columns for the capacity and energy
-        for c in self.column_names:
-            data[c] = np.nan
+        # Gather the columns once as arrays, rather than creating a dataframe for each cycle
+        test_time = data['test_time'].to_numpy()
+        current = data['current'].to_numpy()
+        power = current * data['voltage'].to_numpy()
+        capacity = np.full(len(data), np.nan)
+        energy = np.full(len(data), np.nan)
 
-        # Compute the capacity and energy for each cycle
-        ordered_copy = data.reset_index()  # Ensure a sequential ordering from 0
-        start_inds = ordered_copy.drop_duplicates('cycle_number', keep='first').index
+        # Get the indices of the beginning of each cycle
+        start_inds = np.flatnonzero(~data['cycle_number'].duplicated().to_numpy())
 
         # Loop over each cycle
-        for cyc, (start_ind, stop_ind) in enumerate(zip_longest(start_inds, start_inds[1:] + 1, fillvalue=len(ordered_copy) + 1)):
-            cycle_subset = ordered_copy.iloc[start_ind:stop_ind]
-
+        for start_ind, stop_ind in zip_longest(start_inds, start_inds[1:], fillvalue=len(data)):
             # Perform the integration
-            capacity_change = cumulative_trapezoid(cycle_subset['current'], x=cycle_subset['test_time'], initial=0)
-            energy_change = cumulative_trapezoid(cycle_subset['current'] * cycle_subset['voltage'], x=cycle_subset['test_time'], initial=0)
+            cycle_time = test_time[start_ind:stop_ind]
+            capacity[start_ind:stop_ind] = cumulative_trapezoid(current[start_ind:stop_ind], x=cycle_time, initial=0)
+            energy[start_ind:stop_ind] = cumulative_trapezoid(power[start_ind:stop_ind], x=cycle_time, initial=0)
 
-            # Store them in the raw data
-            data.loc[cycle_subset['index'], 'cycle_capacity'] = capacity_change / 3600  # To A-hr
-            data.loc[cycle_subset['index'], 'cycle_energy'] = energy_change / 3600  # To W-hr
+        # Store them in the raw data
+        data['cycle_capacity'] = capacity / 3600  # To A-hr
+        data['cycle_energy'] = energy / 3600  # To W-hr
@@ -14,6 +14,23 @@ from .base import RawDataEnhancer
 
 logger = logging.getLogger(__name__)
 
+_states_by_sign = np.array([ChargingState.discharging.value, ChargingState.hold.value, ChargingState.charging.value])
+"""Charging state for a current which is negative, zero, or positive"""
+
+
+def assign_charging_state(current: np.ndarray, eps: float) -> np.ndarray:
+    """Determine whether the battery is charging, discharging, or resting from the current
+
+    Args:
+        current: Current at each point, positive when charging
+        eps: Currents with a magnitude below this value are treated as a rest
+    Returns:
+        Value of the :class:`~batdata.schemas.cycling.ChargingState` at each point
+    """
+    #  Compute the sign of the current (-1, 0, 1) then look up the state for each sign
+    sign = (current >= eps).astype(np.int8) - (current <= -eps)
+    return _states_by_sign[sign + 1]
+
 
 class AddMethod(RawDataEnhancer):
     """Determine how the battery was being controlled
@@ -97,13 +114,13 @@ class AddMethod(RawDataEnhancer):
                 methods = []
                 for i in range(len(extrema) - 1):
                     # Get the segment between these two peaks
+                    #  Slicing produces views of the arrays, avoiding a copy for each segment
                     low = extrema[i]
                     high = extrema[i + 1]
-                    r = np.arange(low, high).tolist()
 
                     # Measure the ratio between the change and current and the change in the voltage
-                    s_i = current[r].std()
-                    s_v = voltage[r].std()
+                    s_i = current[low:high].std()
+                    s_v = voltage[low:high].std()
                     val = s_i / max(s_i + s_v, 1e-6)
 
                     if val > 0.66:  # If the change in the current is 2x as large as the change in current
@@ -112,7 +129,7 @@ class AddMethod(RawDataEnhancer):
                         method = ControlMethod.constant_current
                     else:
                         method = ControlMethod.other
-                    methods.extend([method] * len(r))
+                    methods.extend([method] * (high - low))
 
                 assert len(methods) == len(ind), (len(methods), len(ind))
                 df.loc[ind, 'method'] = methods
@@ -161,8 +178,8 @@ def _determine_steps(df: DataFrame, column: str, output_col: str):
 
     # The step number is equal to the number of changes observed previously in a batch
     #  Step 1: Compute the changes since the beginning of file
-    df[output_col] = change.cumsum()
+    steps = change.cumsum()
 
     # Step 2: Adjust so that each cycle starts with step 0
-    for _, cycle in df.groupby("cycle_number"):
-        df.loc[cycle.index, output_col] -= cycle[output_col].min()
+    #  Subtract the first step of each cycle in one grouped operation, rather than looping over cycles
+    df[output_col] = steps - steps.groupby(df['cycle_number']).transform('min')
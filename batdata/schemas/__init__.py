@@ -1,6 +1,7 @@
 """Schemas for battery data and metadata"""
 from datetime import date
-from typing import List, Tuple, Optional, Dict
+from functools import cache
+from typing import List, Tuple, Optional, Dict, Type
 
 from pydantic import BaseModel, Field, AnyUrl
 
@@ -9,6 +10,12 @@ from batdata.schemas.battery import BatteryDescription
 from batdata.version import __version__
 
 
+@cache
+def _get_json_schema(model: Type[BaseModel]) -> dict:
+    """Get the JSON schema for a class of model, which does not change between instances"""
+    return model.model_json_schema()
+
+
 class BatteryMetadata(BaseModel, extra='allow'):
     """Representation for the metadata about a battery
 
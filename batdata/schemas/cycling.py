@@ -5,6 +5,8 @@ from typing import List
 from pydantic import BaseModel, Field
 from pandas import DataFrame
 
+from batdata.schemas import _get_json_schema
+
 
 class ChargingState(str, Enum):
     """Potential charging states of the battery:
@@ -49,7 +51,7 @@ class ColumnSchema(BaseModel):
     @classmethod
     def validate_dataframe(cls, data: DataFrame, allow_extra_columns: bool = True):
         # Get the columns from the schema
-        schema = cls.model_json_schema()
+        schema = _get_json_schema(cls)
         schema_columns = schema['properties']
         required_cols = schema['required']
 
@@ -71,11 +73,11 @@ class ColumnSchema(BaseModel):
                 continue
 
             # Get the data type for the column
-            if '$ref' in col_schema['items']:
-                ref_name = col_schema['items']['$ref'].split("/")[-1]
-                col_type = schema['$defs'][ref_name]['type']
-            else:
-                col_type = col_schema['items']['type']
+            item_schema = col_schema['items']
+            if '$ref' in item_schema:
+                ref_name = item_schema['$ref'].split("/")[-1]
+                item_schema = schema['$defs'][ref_name]
+            col_type = item_schema['type']
 
             # Check data types
             actual_type = data_columns[column]
@@ -90,17 +92,18 @@ class ColumnSchema(BaseModel):
                     raise ValueError(f'Column {column} is a {actual_type} and not a string')
 
             # Check enums
-            enum_values = col_schema['items'].get('enum', None)
+            enum_values = item_schema.get('enum', None)
             if enum_values is not None:
-                is_enum = data[column].isin(enum_values)
-                bad = data[~is_enum][column]
-                if len(bad) > 0:
+                is_enum = data[column].isin(enum_values).to_numpy()
+                if not is_enum.all():
+                    #  Only gather the offending values when reporting an error
+                    bad = data[column].to_numpy()[~is_enum]
                     raise ValueError(f'Column {column} contains values not in enum: {set(bad)}')
 
             # Check if increasing
             if col_schema.get('monotonic', False):
-                is_monotonic = all(y >= x for x, y in zip(data[column], data[column].iloc[1:]))
-                if not is_monotonic:
+                #  Stops at the first decrease without creating temporary arrays
+                if not data[column].is_monotonic_increasing:
                     raise ValueError(f'Column {column} is not monotonically increasing')
 
 
@@ -28,12 +28,25 @@ class EISData(ColumnSchema):
         # Check that the schema is supported
         super().validate_dataframe(data, allow_extra_columns)
 
+        # Fail fast if either form is undefined, rather than comparing against NaNs
+        for col in ['z_real', 'z_imag', 'z_mag', 'z_phase']:
+            if not np.isfinite(data[col].to_numpy()).all():
+                raise ValueError(f'Column {col} contains non-finite values')
+
         # Ensure that the cartesian coordinates for the impedance agree with the magnitude
-        cart = {
-            'real': np.multiply(data['z_mag'], np.cos(np.deg2rad(data['z_phase']))),
-            'imag': np.multiply(data['z_mag'], np.sin(np.deg2rad(data['z_phase'])))
-        }
-        for k, values in cart.items():
-            largest_diff = (np.abs(values - data[f'z_{k}']) / np.clip(values, a_min=1e-6, a_max=None)).max()
+        #  Operate on the underlying arrays and update them in place to avoid creating temporary Series
+        z_mag = data['z_mag'].to_numpy()
+        z_phase = np.deg2rad(data['z_phase'].to_numpy())
+
+        #  Measure differences relative to the magnitude, which bounds both components and is never negative
+        inv_mag = np.maximum(z_mag, 1e-6)
+        np.reciprocal(inv_mag, out=inv_mag)
+        for k, func in [('real', np.cos), ('imag', np.sin)]:
+            values = func(z_phase)
+            values *= z_mag
+            diff = np.subtract(values, data[f'z_{k}'].to_numpy(), out=values)
+            np.abs(diff, out=diff)
+            diff *= inv_mag
+            largest_diff = diff.max(initial=0)
             if largest_diff > 0.01:
                 raise ValueError(f'Polar and cartesian forms of impedance disagree for {k} component. Largest difference: {largest_diff * 100:.1f}%')
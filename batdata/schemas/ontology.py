@@ -1,13 +1,14 @@
 """Tools used for linking terms in our data format to the BattINFO ontology"""
 from dataclasses import dataclass, field
 from functools import cache
-from typing import Type, List, Optional, Union
+from typing import Type, List, Optional, Union, Tuple
 
 from ontopy import World
 from owlready2 import Thing
 from pydantic import BaseModel
 
 _battinfo_url = 'https://raw.githubusercontent.com/emmo-repo/domain-battery/master/battery-inferred.ttl'
+_elucidation_iri = 'https://w3id.org/emmo#EMMO_967080e5_2f42_4eb2_a3a9_c58143e835f9'
 
 
 @cache
@@ -15,6 +16,12 @@ def load_battinfo():
     return World().get_ontology(_battinfo_url).load()
 
 
+@cache
+def _get_elucidation_property():
+    """Get the annotation property used by EMMO to explain a term"""
+    return load_battinfo().search_one(iri=_elucidation_iri)
+
+
 @dataclass
 class TermInfo:
     """Information about a term as referenced from the BattINFO ontology"""
@@ -29,12 +36,33 @@ class TermInfo:
     @classmethod
     def from_thing(cls, thing: Thing):
         # Retrieve the description, as provided by EMMO
-        eluc = thing.get_annotations().get('elucidation')
-        if eluc is not None:
-            eluc = str(eluc[0])
+        #  Reading only the elucidation avoids gathering every annotation of the term,
+        #  but fall back to gathering them all if the ontology lacks the elucidation property
+        prop = _get_elucidation_property()
+        if prop is not None:
+            eluc = prop[thing]
+        else:
+            eluc = thing.get_annotations().get('elucidation', [])
+        eluc = str(eluc[0]) if len(eluc) > 0 else None
         return TermInfo(name=str(thing), iri=thing.iri, elucidation=eluc)
 
 
+@cache
+def _get_iri_fields(model: Type[BaseModel]) -> Tuple[Tuple[str, str], ...]:
+    """Get the name and IRI of the fields in a schema which are linked to the ontology
+
+    Args:
+        model: Schema object to be inspected
+    Returns:
+        Pairs of field name and IRI
+    """
+    output = []
+    for name, attr in model.model_fields.items():
+        if attr.json_schema_extra is not None and (iri := attr.json_schema_extra.get('iri')) is not None:
+            output.append((name, iri))
+    return tuple(output)
+
+
 def cross_reference_terms(model: Type[BaseModel]) -> dict[str, TermInfo]:
     """Gather the descriptions of fields from our schema which
     are cross-referenced to a term within the BattINFO/EMMO ontologies
@@ -48,15 +76,13 @@ def cross_reference_terms(model: Type[BaseModel]) -> dict[str, TermInfo]:
     # Load the BattINFO ontology
     battinfo = load_battinfo()
 
-    # Loop over each field in the schema
+    # Map each field which has a term in the ontology
     terms = {}
-    for name, attr in model.model_fields.items():
-        # Map to the term in the ontology if known
-        if attr.json_schema_extra is not None and (iri := attr.json_schema_extra.get('iri')) is not None:
-            term = battinfo.search_one(iri=iri)
-            if term is None:
-                raise ValueError(f'Count not find matching term for {name} with iri={iri}')
-            terms[name] = TermInfo.from_thing(term)
+    for name, iri in _get_iri_fields(model):
+        term = battinfo.search_one(iri=iri)
+        if term is None:
+            raise ValueError(f'Count not find matching term for {name} with iri={iri}')
+        terms[name] = TermInfo.from_thing(term)
 
     return terms
 
@@ -36,26 +36,13 @@ def drop_cycles(df: DataFrame, digit: int = 2):
 
     # NOTE: we have already converted time to seconds
 
-    # add rounded time to dataframe
-    df['TMP'] = df['test_time']
+    # build the key from the time rounded to specified number of digits, voltage and current
+    #  leaving the input dataframe unmodified
     logger.debug('Removing duplicates from dataframe')
-
-    # round time to specified number of digits
-    df = df.round({'TMP': digit})
-    len1 = len(df)
+    key = DataFrame({'t': df['test_time'].round(digit), 'v': df['voltage'], 'c': df['current']})
 
     # drop points where the rounded time, voltage and current are identical
-    # keep only first instance
-    df.drop_duplicates(subset=['TMP', 'voltage', 'current'], keep='first', inplace=True)
-
-    # re-index dataframe with points dropped
-    df.reset_index(drop=True, inplace=True)
-
-    # calculate number of cycles dropped
-    dropped = len1 - len(df)
-    logger.debug(f'Dropped {dropped} lines')
-
-    # remove the now-unneed column
-    df.drop(columns=['TMP'], inplace=True)
-
-    return df
+    # keep only first instance, and re-index dataframe with points dropped
+    keep = ~key.duplicated(keep='first').to_numpy()
+    logger.debug(f'Dropped {len(df) - keep.sum()} lines')
+    return df[keep].reset_index(drop=True)
@@ -1,5 +1,5 @@
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 
 import pandas as pd
@@ -11,7 +11,7 @@ from batdata.schemas.battery import ElectrodeDescription
 
 def test_export(example_data, tmpdir):
     # Add a datetime
-    example_data.raw_data['time'] = example_data.raw_data['test_time'] + datetime(year=2024, month=7, day=1).timestamp()
+    example_data.raw_data['time'] = example_data.raw_data['test_time'] + datetime(year=2024, month=7, day=1, tzinfo=timezone.utc).timestamp()
 
     # Add some metadata to the file
     example_data.metadata = BatteryMetadata(
@@ -29,6 +29,9 @@ def test_export(example_data, tmpdir):
     # Make sure the time series loaded correctly
     timeseries_path = tmpdir.joinpath('cycle-timeseries-0.csv')
     assert timeseries_path.is_file()
+    with timeseries_path.open() as fp:  # The layout expected by BatteryArchive: no quotes, floats keep their decimal
+        assert fp.readline().rstrip() == 'i,v,date_time,cycle_index,test_time,cell_id'
+        assert fp.readline().startswith('1.0,')
     timeseries = pd.read_csv(timeseries_path)
     assert 'v' in timeseries  # Make sure a conversion occurred correctly
     assert 'cell_id' in timeseries
@@ -38,3 +41,15 @@ def test_export(example_data, tmpdir):
     # Check that metadata was written
     metadata = json.loads(tmpdir.joinpath('metadata.json').read_text())
     assert metadata['cathode'] == '{"name":"nmc"}'
+
+
+def test_chunking(example_data, tmpdir):
+    tmpdir = Path(tmpdir)
+    exporter = BatteryArchiveExporter(chunk_size=len(example_data.raw_data))
+    exporter.write_timeseries('test', example_data.raw_data, tmpdir)
+    assert len(list(tmpdir.glob('cycle-timeseries-*.csv'))) == 1  # No empty file when chunks divide evenly
+
+    exporter.chunk_size = len(example_data.raw_data) // 2 + 1
+    exporter.write_timeseries('test', example_data.raw_data, tmpdir)
+    chunks = [pd.read_csv(tmpdir / f'cycle-timeseries-{i}.csv') for i in range(2)]
+    assert sum(map(len, chunks)) == len(example_data.raw_data)
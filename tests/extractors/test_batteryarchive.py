@@ -0,0 +1,36 @@
+from pytest import fixture
+
+from batdata.extractors.batteryarchive import BatteryArchiveExtractor
+
+
+@fixture()
+def test_files(file_path):
+    return file_path / 'batteryarchive'
+
+
+def test_detect_then_convert(test_files):
+    # Find the pair of files
+    extractor = BatteryArchiveExtractor()
+    group = next(extractor.identify_files(test_files))
+    assert len(group) == 2
+
+    # Parse them
+    data = extractor.parse_to_dataframe(group, None)
+    assert data.raw_data['cycle_number'].dtype.kind == 'i'
+    assert data.raw_data['date_time'].dtype == 'datetime64[ns]'
+    assert data.raw_data['date_time'].iloc[0].year == 2010
+
+    # Ensure it validates
+    data.validate()
+
+
+def test_date_formats(test_files, tmp_path):
+    # Rewrite the dates in a format which is not ISO-8601
+    ts_path = next(test_files.glob('*timeseries.csv'))
+    data = BatteryArchiveExtractor().parse_timeseries_to_dataframe(ts_path)
+    data['Date_Time'] = data.pop('date_time').dt.strftime('%m/%d/%Y %H:%M:%S.%f')
+    data.to_csv(tmp_path / 'timeseries.csv', index=False)
+
+    new_data = BatteryArchiveExtractor().parse_timeseries_to_dataframe(tmp_path / 'timeseries.csv')
+    assert new_data['date_time'].dtype == 'datetime64[ns]'
+    assert new_data['date_time'].iloc[0].month == 9
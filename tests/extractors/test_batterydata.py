@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from pytest import fixture
 
 from batdata.extractors.batterydata import BDExtractor
@@ -21,9 +21,9 @@ def test_detect_then_convert(test_files):
 
     # Test a few of columns which require conversion
     assert data.raw_data['cycle_number'].max() == 8
-    first_measurement = datetime.fromtimestamp(data.raw_data['time'].iloc[0])
+    first_measurement = datetime.fromtimestamp(data.raw_data['time'].iloc[0], tz=timezone.utc)
     assert first_measurement.year == 2020
-    assert first_measurement.day == 3
+    assert first_measurement.day == 2  # Datenum is 737792.44, which is 2020-01-02 in MATLAB
 
     # Ensure it validates
     data.validate()
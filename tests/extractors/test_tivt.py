@@ -0,0 +1,34 @@
+"""Tests related to the tIVT parser"""
+import numpy as np
+from pytest import fixture
+
+from batdata.extractors.tIVT import TIVTExtractor
+from batdata.schemas.cycling import ChargingState
+
+
+@fixture()
+def tivt_file(tmpdir):
+    """Three days of data which alternate between charging, resting, and discharging every 4 hours"""
+    t = np.arange(0, 3 * 24 * 3600, 600.)
+    current = np.tile(np.repeat([1., 0., -1.], 24), 6)
+    voltage = 3.5 + 0.01 * np.cumsum(current)
+    temp = np.full_like(t, 25.)
+
+    path = str(tmpdir / 'test.npy')
+    np.save(path, np.stack([t, current, voltage, temp], axis=1))
+    return path
+
+
+def test_validation(tivt_file):
+    """Make sure the parser generates valid outputs"""
+    tivt = TIVTExtractor()
+    assert list(tivt.group([tivt_file, 'not-tivt.csv'])) == [tivt_file]
+
+    data = tivt.parse_to_dataframe([tivt_file])
+    data.validate_columns()
+
+    # Make sure the states are assigned from the sign of the current
+    raw_data = data.raw_data
+    assert (raw_data['state'][raw_data['current'] > 0] == ChargingState.charging).all()
+    assert (raw_data['state'][raw_data['current'] == 0] == ChargingState.hold).all()
+    assert (raw_data['state'][raw_data['current'] < 0] == ChargingState.discharging).all()
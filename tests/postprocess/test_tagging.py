@@ -4,7 +4,7 @@ import pandas as pd
 from pytest import fixture
 
 from batdata.data import BatteryDataset
-from batdata.postprocess.tagging import AddSteps, AddMethod, AddSubSteps
+from batdata.postprocess.tagging import AddSteps, AddMethod, AddSubSteps, assign_charging_state
 from batdata.schemas.cycling import ChargingState, ControlMethod
 
 
@@ -92,3 +92,8 @@ def test_substep_detect(synthetic_data):
     AddSubSteps().enhance(synthetic_data.raw_data)
     assert (synthetic_data.raw_data['step_index'].iloc[:60] == synthetic_data.raw_data['substep_index'].iloc[:60]).all()
     assert (synthetic_data.raw_data['substep_index'].iloc[60:] == 7).all()
+
+
+def test_charging_state():
+    states = assign_charging_state(np.array([1., 1e-3, 0., -1e-3, -1., np.nan]), eps=1e-2)
+    assert states.tolist() == ['charging', 'hold', 'hold', 'hold', 'discharging', 'hold']
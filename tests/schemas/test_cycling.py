@@ -4,8 +4,8 @@ from pytest import raises, fixture, mark
 import pandas as pd
 
 
-@fixture()
-def example_df() -> pd.DataFrame:
+@fixture(scope='module')
+def base_df() -> pd.DataFrame:
     return pd.DataFrame({
         'cycle_number': [1, 2],
         'test_time': [0, 0.1],
@@ -15,6 +15,12 @@ def example_df() -> pd.DataFrame:
     })
 
 
+@fixture()
+def example_df(base_df) -> pd.DataFrame:
+    """Copy of the example data, which tests are free to modify"""
+    return base_df.copy()
+
+
 def test_required():
     """Catch dataframe missing required columns"""
 
@@ -58,3 +64,11 @@ def test_monotonic(example_df):
 
     example_df['cycle_number'] = [1, 1]
     RawData.validate_dataframe(example_df)
+
+
+def test_enum(example_df):
+    """Columns with values outside of an enum"""
+    example_df['state'] = ['charging', 'exploding']
+    with raises(ValueError) as exc:
+        RawData.validate_dataframe(example_df)
+    assert 'exploding' in str(exc)
@@ -1,4 +1,4 @@
-from pytest import fixture, raises
+from pytest import fixture, raises, mark
 import pandas as pd
 import numpy as np
 
@@ -22,6 +22,13 @@ def test_pass(example_df):
     EISData.validate_dataframe(example_df)
 
 
+def test_negative_component(example_df):
+    example_df['z_imag'] *= -1
+    example_df['z_phase'] *= -1
+    example_df['z_phase'] = example_df['z_phase'].round(1)  # Introduce a small disagreement
+    EISData.validate_dataframe(example_df)
+
+
 def test_consistency(example_df):
     example_df['z_imag'] *= 2
     with raises(ValueError) as e:
@@ -32,3 +39,11 @@ def test_consistency(example_df):
     with raises(ValueError) as e:
         EISData.validate_dataframe(example_df)
     assert 'real' in str(e.value)
+
+
+@mark.parametrize('col', ['z_real', 'z_imag', 'z_mag', 'z_phase'])
+def test_nonfinite(example_df, col):
+    example_df.loc[0, col] = np.nan
+    with raises(ValueError) as e:
+        EISData.validate_dataframe(example_df)
+    assert f'{col} contains non-finite' in str(e.value)
@@ -28,6 +28,12 @@ def test_df():
     return BatteryDataset(raw_data=raw_data, cycle_stats=cycle_stats, metadata={'name': 'Test data'})
 
 
+def test_validated_metadata(test_df):
+    """Metadata which is already validated should not be parsed again"""
+    data = BatteryDataset(metadata=test_df.metadata, raw_data=test_df.raw_data)
+    assert data.metadata is test_df.metadata
+
+
 def test_write_hdf(tmpdir, test_df):
     """Test whether the contents of the HDF5 file are reasonably understandable"""
 
@@ -46,10 +52,11 @@ def test_write_hdf(tmpdir, test_df):
         test_df.to_batdata_hdf(store)
 
 
-def test_read_hdf(tmpdir, test_df):
+@pytest.mark.parametrize('format', ['table', 'fixed'])
+def test_read_hdf(tmpdir, test_df, format):
     # Write it
     out_path = os.path.join(tmpdir, 'test.h5')
-    test_df.to_batdata_hdf(out_path)
+    test_df.to_batdata_hdf(out_path, format=format)
 
     # Test reading only the metadata
     metadata = BatteryDataset.get_metadata_from_hdf5(out_path)
@@ -66,6 +73,11 @@ def test_read_hdf(tmpdir, test_df):
         data = BatteryDataset.from_batdata_hdf(store)
     assert data.metadata.name == 'Test data'
 
+    # Test reading only certain columns
+    data = BatteryDataset.from_batdata_hdf(out_path, columns=('voltage', 'cycle_number'))
+    assert data.raw_data.columns.tolist() == ['voltage']
+    assert data.cycle_stats.columns.tolist() == ['cycle_number']
+
     # Test requesting an unknown type of field
     with raises(ValueError) as exc:
         BatteryDataset.from_batdata_hdf(out_path, subsets=('bad)_!~',))
@@ -79,6 +91,35 @@ def test_read_hdf(tmpdir, test_df):
     assert 'File does not contain' in str(exc)
 
 
+@pytest.mark.parametrize('complib', ['blosc:lz4', 'zlib'])
+def test_compressed_hdf(tmpdir, test_df, complib):
+    out_path = os.path.join(tmpdir, 'test.h5')
+    test_df.to_batdata_hdf(out_path, complevel=5, complib=complib)
+
+    data = BatteryDataset.from_batdata_hdf(out_path)
+    assert np.isclose(data.raw_data['current'], test_df.raw_data['current']).all()
+
+
+def test_iter_hdf(tmpdir, test_df):
+    out_path = os.path.join(tmpdir, 'test.h5')
+    test_df.to_batdata_hdf(out_path, 'a')
+
+    chunks = list(BatteryDataset.iter_batdata_hdf(out_path, prefix='a', chunk_size=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    assert np.isclose(pd.concat(chunks)['current'], test_df.raw_data['current']).all()
+
+    # Test reading only certain columns from an open file
+    with HDFStore(out_path, 'r') as store:
+        chunks = list(BatteryDataset.iter_batdata_hdf(store, prefix='a', columns=['voltage']))
+    assert len(chunks) == 1
+    assert chunks[0].columns.tolist() == ['voltage']
+
+    # Data in the fixed format cannot be read in chunks
+    test_df.to_batdata_hdf(out_path, 'b', append=True, format='fixed')
+    with pytest.raises(ValueError, match='b_raw_data was not stored in the "table" format'):
+        next(BatteryDataset.iter_batdata_hdf(out_path, prefix='b'))
+
+
 def test_multi_cell_hdf5(tmpdir, test_df):
     out_path = os.path.join(tmpdir, 'test.h5')
 
@@ -110,6 +151,7 @@ def test_multi_cell_hdf5(tmpdir, test_df):
     assert len(keys)
     assert np.isclose(keys['a'].raw_data['current'] * 2,
                       keys['b'].raw_data['current']).all()
+    assert keys['a'].metadata is not keys['b'].metadata  # Editing one cell's metadata must not affect another
 
 
 def test_missing_prefix_warning(tmpdir, test_df):
@@ -164,9 +206,14 @@ def test_parquet(test_df, tmpdir):
     for file in written.values():
         metadata = pq.read_schema(file).metadata
         assert b'battery_metadata' in metadata
+        assert pq.ParquetFile(file).metadata.row_group(0).column(0).compression == 'ZSTD'
+    voltage = pq.ParquetFile(written['raw_data']).metadata.row_group(0).column(2)
+    assert voltage.path_in_schema == 'voltage'
+    assert 'BYTE_STREAM_SPLIT' in voltage.encodings
 
     # Read it back in, ensure data are recovered
     read_df = BatteryDataset.from_batdata_parquet(write_dir)
+    assert isinstance(read_df.raw_data, pd.DataFrame)
     assert (read_df.cycle_stats['cycle_number'] == test_df.cycle_stats['cycle_number']).all()
     assert (read_df.raw_data['voltage'] == test_df.raw_data['voltage']).all()
     assert read_df.metadata == test_df.metadata
@@ -177,6 +224,12 @@ def test_parquet(test_df, tmpdir):
     assert read_df.raw_data is None
     assert read_df.cycle_stats is not None
 
+    # Test reading only certain columns
+    read_df = BatteryDataset.from_batdata_parquet(write_dir, columns=('voltage', 'cycle_number'))
+    assert read_df.raw_data.shape == (3, 1)
+    assert (read_df.raw_data['voltage'] == test_df.raw_data['voltage']).all()
+    assert read_df.cycle_stats.shape == (1, 1)
+
     with raises(ValueError) as e:
         BatteryDataset.from_batdata_parquet(tmpdir)
     assert 'No data available' in str(e)
@@ -190,6 +243,21 @@ def test_parquet(test_df, tmpdir):
     assert 'No parquet files' in str(e)
 
 
+def test_iter_parquet(test_df, tmpdir):
+    write_dir = tmpdir / 'parquet-test'
+    test_df.to_batdata_parquet(write_dir)
+
+    chunks = list(BatteryDataset.iter_batdata_parquet(write_dir, chunk_size=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    assert np.isclose(pd.concat(chunks)['voltage'], test_df.raw_data['voltage']).all()
+
+    chunks = list(BatteryDataset.iter_batdata_parquet(write_dir, 'cycle_stats', columns=['cycle_number', 'voltage']))
+    assert chunks[0].columns.tolist() == ['cycle_number']
+
+    with pytest.raises(ValueError, match='Unknown subset'):
+        next(BatteryDataset.iter_batdata_parquet(write_dir, 'raw_dta'))
+
+
 def test_version_warnings(test_df):
     # Alter the version number, then copy using to/from dict
     test_df.metadata.version = 'super.old.version'
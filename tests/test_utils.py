@@ -0,0 +1,19 @@
+import pandas as pd
+
+from batdata.utils import drop_cycles
+
+
+def test_drop_cycles():
+    df = pd.DataFrame({
+        'test_time': [0., 0.001, 1.],
+        'voltage': [1., 1., 1.],
+        'current': [0., 0., 0.],
+    })
+    output = drop_cycles(df)
+    assert len(output) == 2
+    assert (output.index == [0, 1]).all()
+    assert output['test_time'].tolist() == [0., 1.]
+
+    # The input is left unchanged
+    assert len(df) == 3
+    assert df.columns.tolist() == ['test_time', 'voltage', 'current']